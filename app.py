@@ -1,18 +1,81 @@
 import os
+import re
 import json
-import requests
-from datetime import datetime, timedelta
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+import time
+import zlib
+import queue
+import atexit
+import hashlib
+import asyncio
+import logging
+import aiohttp
+import orjson
+import numpy as np
+from cachetools import LRUCache
+from logging.handlers import QueueHandler, QueueListener
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
+from quart import Quart, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+from quart_compress import Compress
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
-# Initialize Flask
-app = Flask(__name__)
-CORS(app)
+# Logging: records are formatted and queued; a background thread writes them out
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+    handlers=[QueueHandler(log_queue)]
+)
+logger = logging.getLogger(__name__)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson straight to bytes"""
+    options = orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.options).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.options)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+# Initialize Quart
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
+app = cors(app)
+
+# Gzip JSON responses; level 4 trades a little ratio for much less CPU
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 4
+Compress(app)
+
+@app.after_request
+async def vary_on_accept_encoding(response):
+    """Mark JSON responses as varying by encoding, compressed or not"""
+    if response.mimetype == 'application/json':
+        response.vary.add('Accept-Encoding')
+    return response
 
 # Configuration
 TRELLO_API_KEY = os.getenv("TRELLO_API_KEY")
@@ -20,186 +83,354 @@ TRELLO_TOKEN = os.getenv("TRELLO_API_TOKEN")
 TRELLO_BOARD_ID = os.getenv("TRELLO_BOARD_ID")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+TRELLO_TIMEOUT = aiohttp.ClientTimeout(total=10)
+TRELLO_CACHE_TTL = int(os.getenv("TRELLO_CACHE_TTL", 20))  # seconds
+TRELLO_RETRIES = 2
+TRELLO_RETRY_BACKOFF = 0.2  # seconds, doubled on each retry
+TRELLO_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+ANALYZE_BATCH_MAX = 20  # tasks per /api/analyze-batch request
+TASK_STREAM_BATCH = 64  # tasks serialized per chunk of the /api/tasks stream
+
 # Initialize Gemini
 genai.configure(api_key=GEMINI_API_KEY)
 model = genai.GenerativeModel('gemini-1.5-flash')
 
+# Gemini analyses keyed by a hash of the task content
+analysis_cache = LRUCache(maxsize=1024)
+
+# Shared HTTP session, opened when the server starts
+http_session = None
+
+@app.before_serving
+async def open_http_session():
+    """Create the pooled HTTP session used for Trello requests"""
+    global http_session
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=10, keepalive_timeout=30, ttl_dns_cache=300)
+    http_session = aiohttp.ClientSession(connector=connector, timeout=TRELLO_TIMEOUT)
+
+@app.after_serving
+async def close_http_session():
+    """Close the pooled HTTP session on shutdown"""
+    await http_session.close()
+
+# Trello response cache: (url, params) -> (fetched_at, etag, json)
+trello_cache = {}
+trello_locks = {}
+
 # ============================================
 # TRELLO API FUNCTIONS
 # ============================================
 
-def get_trello_cards():
-    """Fetch all cards from Trello board"""
-    try:
-        url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/cards"
-        params = {
-            'key': TRELLO_API_KEY,
-            'token': TRELLO_TOKEN
-        }
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching Trello cards: {e}")
-        return []
-
-def get_trello_lists():
-    """Fetch all lists from Trello board"""
-    try:
-        url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/lists"
-        params = {
-            'key': TRELLO_API_KEY,
-            'token': TRELLO_TOKEN
-        }
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching Trello lists: {e}")
-        return []
+async def fetch_trello_json(path, extra_params=None):
+    """GET a Trello resource, serving repeat calls from a short-lived cache"""
+    url = f"https://api.trello.com/1/{path}"
+    params = {
+        'key': TRELLO_API_KEY,
+        'token': TRELLO_TOKEN,
+        **(extra_params or {})
+    }
+    cache_key = (url, tuple(sorted(params.items())))
+    
+    # One in-flight request per resource; concurrent callers wait and reuse it
+    lock = trello_locks.setdefault(cache_key, asyncio.Lock())
+    async with lock:
+        cached = trello_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < TRELLO_CACHE_TTL:
+            return cached[2]
+        
+        # Revalidate a stale entry so Trello can answer 304 Not Modified
+        headers = {}
+        if cached and cached[1]:
+            headers['If-None-Match'] = cached[1]
+        
+        for attempt in range(TRELLO_RETRIES + 1):
+            # Back off before retrying rate limits, server errors and dropped connections
+            if attempt:
+                await asyncio.sleep(TRELLO_RETRY_BACKOFF * 2 ** (attempt - 1))
+            try:
+                async with http_session.get(url, params=params, headers=headers) as response:
+                    if response.status in TRELLO_RETRY_STATUSES and attempt < TRELLO_RETRIES:
+                        continue
+                    if response.status == 304:
+                        etag, data = cached[1], cached[2]
+                    else:
+                        response.raise_for_status()
+                        etag = response.headers.get('ETag')
+                        data = await response.json()
+                    break
+            except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError):
+                # Dropped or refused connections only; timeouts are raised straight away
+                # so a slow Trello doesn't hold the single-flight lock for several timeouts
+                if attempt == TRELLO_RETRIES:
+                    raise
+        
+        trello_cache[cache_key] = (time.monotonic(), etag, data)
+        return data
 
-def get_trello_labels():
-    """Fetch all labels from Trello board"""
+async def get_trello_board_bundle():
+    """Fetch cards, lists and labels from Trello board in one request"""
     try:
-        url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/labels"
-        params = {
-            'key': TRELLO_API_KEY,
-            'token': TRELLO_TOKEN
-        }
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching labels: {e}")
-        return []
+        board = await fetch_trello_json(f"boards/{TRELLO_BOARD_ID}", {
+            'fields': 'name',
+            'cards': 'open',
+            'lists': 'open',
+            'labels': 'all'
+        })
+        return board['cards'], board['lists'], board['labels']
+    except aiohttp.ClientResponseError as e:
+        # str(e) would include the request URL, which carries the API key and token
+        logger.warning("Error fetching Trello board: HTTP %s %s", e.status, e.message)
+        return [], [], []
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning("Error fetching Trello board: %r", e)
+        return [], [], []
 
 def normalize_tasks(trello_cards, trello_lists):
     """Convert Trello cards to normalized task format"""
     list_map = {l['id']: l['name'] for l in trello_lists}
+    label_name = itemgetter('name')
     
     normalized = []
     for card in trello_cards:
-        task = {
+        id_list = card['idList']
+        normalized.append({
             'id': card['id'],
             'title': card['name'],
             'description': card.get('desc', ''),
             'source': 'trello',
-            'status': list_map.get(card['idList'], 'unknown'),
+            'status': list_map.get(id_list, 'unknown'),
             'assignee': card.get('idMembers', []),
-            'deadline': card.get('due', None),
+            'deadline': card.get('due'),
             'url': card.get('url', ''),
-            'labels': [l['name'] for l in card.get('labels', [])],
-            'idList': card.get('idList')
-        }
-        normalized.append(task)
+            'labels': list(map(label_name, card.get('labels', ()))),
+            'idList': id_list
+        })
     
     return normalized
 
+@lru_cache(maxsize=4096)
+def parse_deadline(deadline):
+    """Parse a Trello due date into a naive UTC datetime (None if unparseable)"""
+    try:
+        deadline_date = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return deadline_date.astimezone(timezone.utc).replace(tzinfo=None)
+
 # ============================================
 # PRIORITY CALCULATION ENGINE
 # ============================================
 
-def calculate_priority_score(task, all_tasks):
-    """
-    Calculate priority score (0-100) using algorithm
-    
-    Formula:
-    Priority = (Urgency × 30%) + (Strategic × 20%) + 
-               (Dependency × 25%) + (Capacity × 15%) + (Risk × 10%)
-    """
-    
-    # 1. DEADLINE URGENCY (0-100)
-    deadline = task.get('deadline')
-    if deadline:
-        try:
-            deadline_date = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
-            now = datetime.now(deadline_date.tzinfo)
-            days_until = (deadline_date - now).days
-            hours_until = (deadline_date - now).total_seconds() / 3600
-            
-            if hours_until < 0:
-                urgency = 100  # Overdue
-            elif hours_until < 24:
-                urgency = 90   # Due today
-            elif days_until == 1:
-                urgency = 80   # Due tomorrow
-            elif days_until <= 3:
-                urgency = 60
-            elif days_until <= 7:
-                urgency = 40
-            else:
-                urgency = 20
-        except:
-            urgency = 30
-    else:
-        urgency = 10
-    
-    # 2. STRATEGIC ALIGNMENT (0-100)
-    labels = task.get('labels', [])
-    title = task.get('title', '').lower()
+# Label and title keyword lookups shared by the scorers
+LABEL_FLAGS = {
+    'critical': 1, 'blocker': 2, 'emergency': 4,
+    'high': 8, 'urgent': 16,
+    'low': 32, 'nice to have': 64
+}
+TITLE_FLAGS = {'bug': 1, 'fix': 2, 'error': 4, 'deploy': 8, 'production': 16}
+TITLE_KEYWORDS = re.compile('(bug|fix|error|deploy|production)')
+STATUS_CODES = {'In Progress': 1, 'In Review': 2}
+TEAM_CAPACITY_BY_ASSIGNEES = np.array([60, 70, 50, 30])
+
+def score_columns(seconds_until, bad_deadline, label_mask, title_flags,
+                  blocks_others, assignees, status_codes, out):
+    """Fill out with raw priority scores using NumPy array operations"""
+    # 1. DEADLINE URGENCY
+    hours_until = seconds_until / 3600
+    days_until = np.floor(seconds_until / 86400)
+    urgency = np.select(
+        [bad_deadline, np.isnan(seconds_until), hours_until < 0, hours_until < 24,
+         days_until == 1, days_until <= 3, days_until <= 7],
+        [30, 10, 100, 90, 80, 60, 40],
+        default=20
+    )
     
-    if 'critical' in labels or 'blocker' in labels or 'emergency' in labels:
-        strategic = 90
-    elif 'high' in labels or 'urgent' in labels:
-        strategic = 70
-    elif 'bug' in title or 'fix' in title or 'error' in title:
-        strategic = 75
-    elif 'low' in labels or 'nice to have' in labels:
-        strategic = 25
-    else:
-        strategic = 50
+    # 2. STRATEGIC ALIGNMENT
+    strategic = np.select(
+        [(label_mask & 7) != 0, (label_mask & 24) != 0, (title_flags & 7) != 0, (label_mask & 96) != 0],
+        [90, 70, 75, 25],
+        default=50
+    )
     
-    # 3. DEPENDENCY IMPACT (0-100)
-    description = task.get('description', '').lower()
-    if 'blocker' in description or 'blocks' in description:
-        dependency_impact = 85
-    elif task.get('status') in ['In Progress', 'In Review']:
-        dependency_impact = 60
-    else:
-        dependency_impact = 30
+    # 3. DEPENDENCY IMPACT
+    dependency_impact = np.select([blocks_others, status_codes != 0], [85, 60], default=30)
     
-    # 4. TEAM CAPACITY (0-100)
-    assignees = len(task.get('assignee', []))
-    if assignees == 0:
-        team_capacity = 60
-    elif assignees == 1:
-        team_capacity = 70
-    elif assignees == 2:
-        team_capacity = 50
-    else:
-        team_capacity = 30
+    # 4. TEAM CAPACITY
+    team_capacity = TEAM_CAPACITY_BY_ASSIGNEES[assignees]
     
-    # 5. RISK FACTOR (0-100)
-    if task.get('status') == 'In Progress':
-        risk = 40
-    elif task.get('status') == 'In Review':
-        risk = 50
-    elif 'bug' in title:
-        risk = 70
-    elif 'deploy' in title or 'production' in title.lower():
-        risk = 75
-    else:
-        risk = 30
+    # 5. RISK FACTOR
+    risk = np.select(
+        [status_codes == 1, status_codes == 2, (title_flags & 1) != 0, (title_flags & 24) != 0],
+        [40, 50, 70, 75],
+        default=30
+    )
     
     # FINAL CALCULATION
-    priority_score = (
+    out[:] = (
         (urgency * 0.30) +
         (strategic * 0.20) +
         (dependency_impact * 0.25) +
         (team_capacity * 0.15) +
         (risk * 0.10)
     )
+
+def score_loop(seconds_until, bad_deadline, label_mask, title_flags,
+               blocks_others, assignees, status_codes, out):
+    """Fill out with raw priority scores, one task at a time (compiled by Numba)"""
+    for i in range(out.shape[0]):
+        # 1. DEADLINE URGENCY
+        seconds = seconds_until[i]
+        if bad_deadline[i]:
+            urgency = 30
+        elif np.isnan(seconds):
+            urgency = 10
+        elif seconds < 0:
+            urgency = 100
+        elif seconds < 86400:
+            urgency = 90
+        else:
+            days = seconds // 86400
+            if days == 1:
+                urgency = 80
+            elif days <= 3:
+                urgency = 60
+            elif days <= 7:
+                urgency = 40
+            else:
+                urgency = 20
+        
+        # 2. STRATEGIC ALIGNMENT
+        labels = label_mask[i]
+        keywords = title_flags[i]
+        if labels & 7:
+            strategic = 90
+        elif labels & 24:
+            strategic = 70
+        elif keywords & 7:
+            strategic = 75
+        elif labels & 96:
+            strategic = 25
+        else:
+            strategic = 50
+        
+        # 3. DEPENDENCY IMPACT
+        status = status_codes[i]
+        if blocks_others[i]:
+            dependency_impact = 85
+        elif status != 0:
+            dependency_impact = 60
+        else:
+            dependency_impact = 30
+        
+        # 4. TEAM CAPACITY
+        count = assignees[i]
+        if count == 0:
+            team_capacity = 60
+        elif count == 1:
+            team_capacity = 70
+        elif count == 2:
+            team_capacity = 50
+        else:
+            team_capacity = 30
+        
+        # 5. RISK FACTOR
+        if status == 1:
+            risk = 40
+        elif status == 2:
+            risk = 50
+        elif keywords & 1:
+            risk = 70
+        elif keywords & 24:
+            risk = 75
+        else:
+            risk = 30
+        
+        # FINAL CALCULATION
+        out[i] = (
+            (urgency * 0.30) +
+            (strategic * 0.20) +
+            (dependency_impact * 0.25) +
+            (team_capacity * 0.15) +
+            (risk * 0.10)
+        )
+
+if _NUMBA_AVAILABLE:
+    score_tasks = njit(cache=True)(score_loop)
+    # Compile at import so the first request doesn't pay for it
+    score_tasks(
+        np.zeros(1), np.zeros(1, dtype=bool), np.zeros(1, dtype=np.uint16),
+        np.zeros(1, dtype=np.uint16), np.zeros(1, dtype=bool),
+        np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.int8), np.empty(1)
+    )
+else:
+    score_tasks = score_columns
+
+def calculate_priority_scores(tasks):
+    """
+    Calculate priority scores (0-100) for a list of tasks in one pass
+    
+    Formula:
+    Priority = (Urgency × 30%) + (Strategic × 20%) + 
+               (Dependency × 25%) + (Capacity × 15%) + (Risk × 10%)
+    
+    Returns a NumPy array of scores in task order.
+    """
+    # Build one column per input feature
+    deadlines = []
+    bad_deadline = []
+    label_mask = []
+    title_flags = []
+    blocks_others = []
+    assignees = []
+    status_codes = []
+    
+    for task in tasks:
+        deadline = task.get('deadline')
+        deadline_date = parse_deadline(deadline) if deadline else None
+        deadlines.append(deadline_date)
+        bad_deadline.append(bool(deadline) and deadline_date is None)
+        
+        mask = 0
+        for label in task.get('labels', []):
+            mask |= LABEL_FLAGS.get(label, 0)
+        label_mask.append(mask)
+        
+        flags = 0
+        for keyword in TITLE_KEYWORDS.findall(task.get('title', '').lower()):
+            flags |= TITLE_FLAGS[keyword]
+        title_flags.append(flags)
+        
+        description = task.get('description', '').lower()
+        blocks_others.append('blocker' in description or 'blocks' in description)
+        assignees.append(min(len(task.get('assignee', [])), 3))
+        status_codes.append(STATUS_CODES.get(task.get('status'), 0))
+    
+    deadlines = np.array(deadlines, dtype='datetime64[s]')
+    now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 'us')
+    seconds_until = (deadlines - now) / np.timedelta64(1, 's')
+    
+    priority_scores = np.empty(len(tasks))
+    score_tasks(
+        seconds_until,
+        np.array(bad_deadline, dtype=bool),
+        np.array(label_mask, dtype=np.uint16),
+        np.array(title_flags, dtype=np.uint16),
+        np.array(blocks_others, dtype=bool),
+        np.array(assignees, dtype=np.int8),
+        np.array(status_codes, dtype=np.int8),
+        priority_scores
+    )
     
-    return round(min(100, max(0, priority_score)), 1)
+    return np.round(np.clip(priority_scores, 0, 100), 1)
 
 # ============================================
 # AI ANALYSIS WITH GEMINI
 # ============================================
 
-def analyze_task_with_ai(task, all_tasks):
-    """Use Gemini to analyze task and provide insights"""
-    try:
-        prompt = f"""
+def build_task_prompt(task):
+    """Build the Gemini prompt for a single task analysis"""
+    return f"""
 Analyze this project task and provide a brief, actionable insight (2-3 sentences max):
 
 Task: {task['title']}
@@ -215,20 +446,96 @@ Provide:
 
 Keep it brief and professional.
 """
-        response = model.generate_content(prompt, stream=False)
+
+def task_content_key(task):
+    """Hash the task fields that feed the analysis prompt"""
+    content = {field: task.get(field) for field in ('title', 'description', 'status', 'deadline', 'labels')}
+    return hashlib.blake2b(json.dumps(content, sort_keys=True).encode(), digest_size=16).digest()
+
+async def analyze_task_with_ai(task, all_tasks):
+    """Use Gemini to analyze task and provide insights"""
+    key = task_content_key(task)
+    if key in analysis_cache:
+        return analysis_cache[key]
+    try:
+        response = await model.generate_content_async(build_task_prompt(task))
+        analysis_cache[key] = response.text
         return response.text
     except Exception as e:
         return f"Could not analyze: {str(e)[:100]}"
 
-def predict_project_risk(tasks):
+async def stream_task_analysis(task):
+    """Yield Gemini's analysis of a task as it is generated"""
+    key = task_content_key(task)
+    if key in analysis_cache:
+        yield analysis_cache[key]
+        return
+    try:
+        response = await model.generate_content_async(build_task_prompt(task), stream=True)
+        parts = []
+        async for chunk in response:
+            parts.append(chunk.text)
+            yield chunk.text
+        analysis_cache[key] = ''.join(parts)
+    except Exception as e:
+        yield f"Could not analyze: {str(e)[:100]}"
+
+BATCH_ANALYSIS_SCHEMA = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'string'},
+            'risk': {'type': 'string'},
+            'why': {'type': 'string'},
+            'suggestion': {'type': 'string'}
+        },
+        'required': ['id', 'risk', 'why', 'suggestion']
+    }
+}
+
+async def analyze_tasks_with_ai(tasks):
+    """Use a single Gemini request to analyze several tasks"""
+    task_blocks = "\n\n".join(
+        f"""ID: {task['id']}
+Task: {task['title']}
+Description: {task.get('description', 'No description')}
+Status: {task['status']}
+Due: {task.get('deadline', 'No deadline')}
+Labels: {', '.join(task.get('labels', ['none']))}"""
+        for task in tasks
+    )
+    prompt = f"""
+Analyze each of these project tasks. For every task, return one entry with its ID,
+a risk assessment (low/medium/high), why it matters (one sentence) and one
+actionable suggestion (one sentence).
+
+{task_blocks}
+
+Keep it brief and professional.
+"""
+    response = await model.generate_content_async(
+        prompt,
+        generation_config=genai.GenerationConfig(
+            response_mime_type='application/json',
+            response_schema=BATCH_ANALYSIS_SCHEMA
+        )
+    )
+    return json.loads(response.text)
+
+async def predict_project_risk(tasks):
     """Use Gemini to predict if project is at risk"""
     try:
-        done_count = sum(1 for t in tasks if t['status'] == 'Done')
-        in_progress = sum(1 for t in tasks if t['status'] == 'In Progress')
+        statuses = np.array([t['status'] for t in tasks])
+        done_count = int(np.count_nonzero(statuses == 'Done'))
+        in_progress = int(np.count_nonzero(statuses == 'In Progress'))
         total = len(tasks)
         
-        overdue = sum(1 for t in tasks if t.get('deadline') and 
-                     datetime.fromisoformat(t['deadline'].replace('Z', '+00:00')) < datetime.now(datetime.now().astimezone().tzinfo))
+        # Missing or unparseable deadlines become NaT and never count as overdue
+        deadlines = np.array([parse_deadline(t['deadline']) if t.get('deadline') else None for t in tasks],
+                             dtype='datetime64[ms]')
+        now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 'ms')
+        overdue = int(np.count_nonzero(deadlines < now))
         
         prompt = f"""
 Analyze project health and predict risks:
@@ -247,7 +554,7 @@ Provide (2-3 sentences):
 
 Be direct and concise.
 """
-        response = model.generate_content(prompt, stream=False)
+        response = await model.generate_content_async(prompt)
         return response.text
     except Exception as e:
         return f"Could not predict: {str(e)[:100]}"
@@ -257,7 +564,7 @@ Be direct and concise.
 # ============================================
 
 @app.route('/', methods=['GET'])
-def home():
+async def home():
     """Root endpoint - Render health check"""
     return jsonify({
         'status': 'OK',
@@ -269,13 +576,14 @@ def home():
             'next_task': '/api/next-task',
             'summary': '/api/summary',
             'analyze': '/api/analyze (POST)',
+            'analyze_batch': '/api/analyze-batch (POST)',
             'risk': '/api/risk',
             'blockers': '/api/blockers'
         }
     }), 200
 
 @app.route('/api/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'OK',
@@ -283,12 +591,27 @@ def health():
         'timestamp': datetime.now().isoformat()
     }), 200
 
+async def stream_tasks_json(tasks, compress=False):
+    """Yield the /api/tasks JSON body a batch of tasks at a time"""
+    compressor = zlib.compressobj(app.config['COMPRESS_LEVEL'], zlib.DEFLATED, 31) if compress else None
+    
+    def encode(data, flush_mode=zlib.Z_SYNC_FLUSH):
+        if not compressor:
+            return data
+        return compressor.compress(data) + compressor.flush(flush_mode)
+    
+    yield encode(b'{"success":true,"total_tasks":%d,"tasks":[' % len(tasks))
+    for start in range(0, len(tasks), TASK_STREAM_BATCH):
+        batch = b','.join(orjson.dumps(task, option=OrjsonProvider.options)
+                          for task in tasks[start:start + TASK_STREAM_BATCH])
+        yield encode(b',' + batch if start else batch)
+    yield encode(b']}', zlib.Z_FINISH)
+
 @app.route('/api/tasks', methods=['GET'])
-def get_all_tasks():
+async def get_all_tasks():
     """Get all tasks with priority scoring"""
     try:
-        cards = get_trello_cards()
-        lists = get_trello_lists()
+        cards, lists, _ = await get_trello_board_bundle()
         
         if not cards:
             return jsonify({
@@ -299,16 +622,19 @@ def get_all_tasks():
         
         tasks = normalize_tasks(cards, lists)
         
-        for task in tasks:
-            task['priority_score'] = calculate_priority_score(task, tasks)
+        scores = calculate_priority_scores(tasks)
+        for task, score in zip(tasks, scores.tolist()):
+            task['priority_score'] = score
         
-        tasks.sort(key=lambda x: x['priority_score'], reverse=True)
+        tasks.sort(key=itemgetter('priority_score'), reverse=True)
         
-        return jsonify({
-            'success': True,
-            'total_tasks': len(tasks),
-            'tasks': tasks
-        }), 200
+        # Stream the body (gzipped on the fly when accepted) instead of buffering it
+        compress = 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+        headers = {'Content-Type': 'application/json', 'Vary': 'Accept-Encoding'}
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+        
+        return stream_tasks_json(tasks, compress), 200, headers
     except Exception as e:
         return jsonify({
             'success': False,
@@ -316,11 +642,10 @@ def get_all_tasks():
         }), 500
 
 @app.route('/api/next-task', methods=['GET'])
-def get_next_task():
+async def get_next_task():
     """Get the highest priority task"""
     try:
-        cards = get_trello_cards()
-        lists = get_trello_lists()
+        cards, lists, _ = await get_trello_board_bundle()
         
         if not cards:
             return jsonify({
@@ -330,12 +655,11 @@ def get_next_task():
         
         tasks = normalize_tasks(cards, lists)
         
-        for task in tasks:
-            task['priority_score'] = calculate_priority_score(task, tasks)
-        
-        tasks.sort(key=lambda x: x['priority_score'], reverse=True)
-        
-        top_task = tasks[0]
+        # Only the top task is returned; argmax keeps the first of any ties, like a stable sort
+        scores = calculate_priority_scores(tasks)
+        top = int(np.argmax(scores))
+        top_task = tasks[top]
+        top_task['priority_score'] = scores[top].item()
         
         return jsonify({
             'success': True,
@@ -349,28 +673,24 @@ def get_next_task():
         }), 500
 
 @app.route('/api/summary', methods=['GET'])
-def get_summary():
+async def get_summary():
     """Get project summary"""
     try:
-        cards = get_trello_cards()
-        lists = get_trello_lists()
-        
-        tasks = normalize_tasks(cards, lists)
+        cards, lists, _ = await get_trello_board_bundle()
         
-        status_counts = {}
-        for task in tasks:
-            status = task['status']
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # Only counts are needed, so skip building full task dicts
+        list_map = {l['id']: l['name'] for l in lists}
+        status_counts = Counter(list_map.get(card['idList'], 'unknown') for card in cards)
         
         completion_rate = 0
-        if tasks:
-            done_count = status_counts.get('Done', 0)
-            completion_rate = round((done_count / len(tasks)) * 100)
+        if cards:
+            done_count = status_counts['Done']
+            completion_rate = round((done_count / len(cards)) * 100)
         
         return jsonify({
             'success': True,
             'summary': {
-                'total_tasks': len(tasks),
+                'total_tasks': len(cards),
                 'completion_rate': completion_rate,
                 'by_status': status_counts
             }
@@ -382,14 +702,13 @@ def get_summary():
         }), 500
 
 @app.route('/api/analyze', methods=['POST'])
-def analyze_task_endpoint():
+async def analyze_task_endpoint():
     """Analyze a specific task with AI"""
     try:
-        data = request.json
+        data = await request.get_json()
         task_id = data.get('task_id')
         
-        cards = get_trello_cards()
-        lists = get_trello_lists()
+        cards, lists, _ = await get_trello_board_bundle()
         tasks = normalize_tasks(cards, lists)
         
         task = next((t for t in tasks if t['id'] == task_id), None)
@@ -400,7 +719,11 @@ def analyze_task_endpoint():
                 'error': 'Task not found'
             }), 404
         
-        analysis = analyze_task_with_ai(task, tasks)
+        # Stream plain text as it is generated if the client asks for it
+        if data.get('stream'):
+            return stream_task_analysis(task), 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        
+        analysis = await analyze_task_with_ai(task, tasks)
         
         return jsonify({
             'success': True,
@@ -414,12 +737,59 @@ def analyze_task_endpoint():
             'error': str(e)
         }), 500
 
+@app.route('/api/analyze-batch', methods=['POST'])
+async def analyze_batch_endpoint():
+    """Analyze several tasks with a single AI request"""
+    try:
+        data = await request.get_json()
+        task_ids = data.get('task_ids') if isinstance(data, dict) else None
+        
+        if (not isinstance(task_ids, list) or not task_ids
+                or not all(isinstance(task_id, str) for task_id in task_ids)):
+            return jsonify({
+                'success': False,
+                'error': 'task_ids must be a non-empty list of task IDs'
+            }), 400
+        
+        task_ids = list(dict.fromkeys(task_ids))
+        if len(task_ids) > ANALYZE_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'error': f'At most {ANALYZE_BATCH_MAX} tasks per batch'
+            }), 400
+        
+        cards, lists, _ = await get_trello_board_bundle()
+        tasks_by_id = {t['id']: t for t in normalize_tasks(cards, lists)}
+        
+        selected = [tasks_by_id[task_id] for task_id in task_ids if task_id in tasks_by_id]
+        missing = [task_id for task_id in task_ids if task_id not in tasks_by_id]
+        
+        if not selected:
+            return jsonify({
+                'success': False,
+                'error': 'Task not found',
+                'missing': missing
+            }), 404
+        
+        analyses = await analyze_tasks_with_ai(selected)
+        
+        return jsonify({
+            'success': True,
+            'analyses': analyses,
+            'count': len(analyses),
+            'missing': missing
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/risk', methods=['GET'])
-def get_risk_prediction():
+async def get_risk_prediction():
     """Get AI risk prediction for project"""
     try:
-        cards = get_trello_cards()
-        lists = get_trello_lists()
+        cards, lists, _ = await get_trello_board_bundle()
         tasks = normalize_tasks(cards, lists)
         
         if not tasks:
@@ -428,7 +798,7 @@ def get_risk_prediction():
                 'message': 'No tasks to analyze'
             }), 200
         
-        risk_analysis = predict_project_risk(tasks)
+        risk_analysis = await predict_project_risk(tasks)
         
         return jsonify({
             'success': True,
@@ -441,17 +811,18 @@ def get_risk_prediction():
         }), 500
 
 @app.route('/api/blockers', methods=['GET'])
-def get_blockers():
+async def get_blockers():
     """Get tasks that are blocking others"""
     try:
-        cards = get_trello_cards()
-        lists = get_trello_lists()
+        cards, lists, _ = await get_trello_board_bundle()
         tasks = normalize_tasks(cards, lists)
         
         blockers = [t for t in tasks if 'blocker' in t.get('labels', []) or 
                    'blocker' in t.get('description', '').lower()]
         
-        blockers.sort(key=lambda x: calculate_priority_score(x, tasks), reverse=True)
+        # Score each blocker once, then order by descending score (stable for ties)
+        scores = calculate_priority_scores(blockers)
+        blockers = [blockers[i] for i in np.argsort(-scores, kind='stable')]
         
         return jsonify({
             'success': True,
@@ -469,11 +840,11 @@ def get_blockers():
 # ============================================
 
 @app.errorhandler(404)
-def not_found(error):
+async def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
 @app.errorhandler(500)
-def server_error(error):
+async def server_error(error):
     return jsonify({'error': 'Server error', 'message': str(error)}), 500
 
 # ============================================
@@ -481,6 +852,8 @@ def server_error(error):
 # ============================================
 
 if __name__ == '__main__':
+    import uvicorn
+
     # Get port from environment variable (required for Render)
     port = int(os.getenv('PORT', 10000))
     
@@ -488,9 +861,10 @@ if __name__ == '__main__':
     print(f"📍 Running on port {port}")
     print(f"🧪 Health check: http://0.0.0.0:{port}/api/health")
     
-    # CRITICAL: Must bind to 0.0.0.0 for Render
-    app.run(
-        host='0.0.0.0',
-        port=port,
-        debug=False  # Disable debug in production
-    )
+    if os.getenv('DEV'):
+        # Local development: Quart's reloading debug server
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        # CRITICAL: Must bind to 0.0.0.0 for Render
+        workers = int(os.getenv('WEB_CONCURRENCY', 1))
+        uvicorn.run('app:app', host='0.0.0.0', port=port, workers=workers)
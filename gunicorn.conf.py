@@ -0,0 +1,17 @@
+# Production server settings, picked up by `gunicorn app:app`
+import os
+
+# CRITICAL: Must bind to 0.0.0.0 for Render
+bind = f"0.0.0.0:{os.getenv('PORT', 10000)}"
+
+# Async workers: each one serves many concurrent requests on its event loop,
+# so one per usable CPU is enough. Every worker keeps its own Trello and Gemini
+# caches, and each extra worker adds Trello calls and Gemini cache misses.
+# sched_getaffinity respects a container's CPU set; cpu_count reports the host.
+worker_class = 'uvicorn.workers.UvicornWorker'
+cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+workers = int(os.getenv('WEB_CONCURRENCY', cpus))
+
+# Gemini calls can take a while; don't kill workers mid-request
+timeout = 60
+keepalive = 5